@@ -7,5 +7,10 @@ out vec4 frag_color;
 
 void main(){
 	//frag_color = vec4(1.0, 1.0, 1.0, 1.0);
+#ifdef SRC_FORMAT_BGR
+	// The texels hold BGR bytes as uploaded (see Viewer.__init__)
+	frag_color = vec4(texture(sampler, uvpos).bgr, 1.0);
+#else
 	frag_color = vec4(texture(sampler, uvpos).rgb, 1.0);
+#endif
 }
@@ -4,12 +4,14 @@ layout(location = 0) in vec3 position;
 layout(location = 1) in vec2 vertex_uv;
 //layout(location = 1) in vec4 color;
 
-uniform mat4 mvp_matrix;
+uniform mat4 projection_matrix;
+uniform mat4 view_matrix;
 
 //out vec4 v_color;
 out vec2 uvpos;
 
 void main(){
-	gl_Position = mvp_matrix * vec4(position, 1);
-	uvpos = vertex_uv;
+	gl_Position = projection_matrix * (view_matrix * vec4(position, 1));
+	// The texture is stored from top to bottom, so flip v instead of flipping the image on upload
+	uvpos = vec2(vertex_uv.x, 1.0 - vertex_uv.y);
 }
@@ -1,6 +1,11 @@
 import sys
+import os
 import typing
+import hashlib
+import functools
+import tempfile
 import dataclasses
+import logging
 import numpy as np
 import cv2
 import OpenGL.GL as gl
@@ -8,9 +13,396 @@ import glfw
 import glm
 import ctypes
 
+"""
+@var logger
+@brief The logger to which errors are reported. 
+"""
+logger = logging.getLogger(__name__)
+
+"""
+@var DEBUG
+@brief Whether to run the checks which stall the pipeline. Enabled by setting the environment variable VIEWER_DEBUG. 
+"""
+DEBUG = bool(os.environ.get("VIEWER_DEBUG"))
+
+"""
+@var SHADER_CACHE_DIR
+@brief The directory in which linked shader program binaries are cached. 
+"""
+SHADER_CACHE_DIR = os.path.join(
+        os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "pyopengl_sample")
+
+"""
+@var TEXTURE_RING_SIZE
+@brief The number of regions in the pixel buffer ring used by Viewer.update_texture(). 
+"""
+TEXTURE_RING_SIZE = 3
+
+"""
+@var VERTEX_RING_SIZE
+@brief The number of regions in the vertex buffer ring used by Viewer.update_vertices(). 
+"""
+VERTEX_RING_SIZE = 3
+
+"""
+@var IDLE_TIMEOUT
+@brief The maximum time in seconds update() sleeps in "auto" mode when nothing has changed. 
+@detail The sleep is bounded so that the updates of the texture or the vertices from the caller are still shown. 
+"""
+IDLE_TIMEOUT = 1. / 60.
+
+"""
+@var DRAW_ARRAYS_INDIRECT_COMMAND
+@brief The layout of a command in the buffer read by glMultiDrawArraysIndirect(). 
+"""
+DRAW_ARRAYS_INDIRECT_COMMAND = np.dtype([
+    ("count", np.uint32), 
+    ("instance_count", np.uint32), 
+    ("first", np.uint32), 
+    ("base_instance", np.uint32)])
+
+"""
+@var CAMERA_KEYS
+@brief The keys moving the camera, in the order of the rows of CAMERA_KEY_MOTIONS. 
+"""
+CAMERA_KEYS = (
+    glfw.KEY_W, glfw.KEY_S, glfw.KEY_D, glfw.KEY_A, 
+    glfw.KEY_UP, glfw.KEY_DOWN, glfw.KEY_LEFT, glfw.KEY_RIGHT)
+
+"""
+@var EXIT_KEY
+@brief The key closing the viewer. 
+"""
+EXIT_KEY = glfw.KEY_ESCAPE
+
+"""
+@var RESET_KEY
+@brief The key resetting the camera to its initial pose. 
+"""
+RESET_KEY = glfw.KEY_SPACE
+
+"""
+@var SHIFT_KEY
+@brief The key switching CAMERA_KEY_MOTIONS to the motions with shift. 
+"""
+SHIFT_KEY = glfw.KEY_LEFT_SHIFT
+
+"""
+@var TRANSLATE_BUTTON
+@brief The mouse button translating the camera while dragged. 
+"""
+TRANSLATE_BUTTON = glfw.MOUSE_BUTTON_LEFT
+
+"""
+@var ROTATE_BUTTON
+@brief The mouse button rotating the camera while dragged. 
+"""
+ROTATE_BUTTON = glfw.MOUSE_BUTTON_RIGHT
+
+"""
+@var _GLFW_PRESS, _GL_TRUE, _GL_COLOR_BUFFER_BIT, _GL_TRIANGLES, _GL_TRIANGLE_STRIP
+@brief The enums used every frame, bound once instead of looked up in the modules. 
+"""
+_GLFW_PRESS = glfw.PRESS
+_GL_TRUE = gl.GL_TRUE
+_GL_COLOR_BUFFER_BIT = gl.GL_COLOR_BUFFER_BIT
+_GL_TRIANGLES = gl.GL_TRIANGLES
+_GL_TRIANGLE_STRIP = gl.GL_TRIANGLE_STRIP
+
+"""
+@var CAMERA_KEY_MOTIONS
+@brief The camera motion per frame while each key is held, without and with the left shift key. 
+@detail Each row is (translation x, y, z, rotation x, y, z), and the rotation angles are in degrees. 
+"""
+CAMERA_KEY_MOTIONS = np.array([
+    [
+        [0., 0., 0.01, 0., 0., 0.],  # W: forward
+        [0., 0., -0.01, 0., 0., 0.],  # S: backward
+        [0.01, 0., 0., 0., 0., 0.],  # D: right
+        [-0.01, 0., 0., 0., 0., 0.],  # A: left
+        [0., 0., 0., 0.005, 0., 0.],  # Up
+        [0., 0., 0., -0.005, 0., 0.],  # Down
+        [0., 0., 0., 0., 0.005, 0.],  # Left
+        [0., 0., 0., 0., -0.005, 0.]],  # Right
+    [
+        [0., 0.01, 0., 0., 0., 0.],  # Shift + W: up
+        [0., -0.01, 0., 0., 0., 0.],  # Shift + S: down
+        [0.01, 0., 0., 0., 0., 0.], 
+        [-0.01, 0., 0., 0., 0., 0.], 
+        [0., 0., 0., 0.005, 0., 0.], 
+        [0., 0., 0., -0.005, 0., 0.], 
+        [0., 0., 0., 0., 0.005, 0.], 
+        [0., 0., 0., 0., -0.005, 0.]]], dtype=np.float32)
+
+"""
+@var _camera_key_index
+@brief The row of each key of CAMERA_KEYS in CAMERA_KEY_MOTIONS. 
+"""
+_camera_key_index: typing.Dict[int, int] = {key: index for index, key in enumerate(CAMERA_KEYS)}
+
+"""
+@var _glfw_refcount
+@brief The number of viewers which are not closed. GLFW is initialized by the first one and terminated with the last one. 
+"""
+_glfw_refcount: int = 0
+
+"""
+@var _share_window
+@brief The window whose OpenGL context shares its objects with every window created afterwards. 
+"""
+_share_window: typing.Optional[glfw._GLFWwindow] = None
+
+@functools.lru_cache(maxsize=None)
+def _read_shader_source(filename: str, mtime: float) -> str:
+    """
+    @fn _read_shader_source()
+    @brief Read shader script from a file. 
+    @param filename The filename of a shader file. 
+    @param mtime The modification time of the file, which invalidates the memoized source when the file is edited. 
+    @return The source code of the shader. 
+    """
+    with open(filename) as shader_file:
+        return shader_file.read()
+
+def _specialize_shader(shader_code: str, defines: typing.Optional[typing.Dict[str, str]]) -> str:
+    """
+    @fn _specialize_shader()
+    @brief Generate a permutation of shader script by inserting preprocessor definitions right after the #version directive. 
+    @param shader_code The source code of the shader. 
+    @param defines The macros to define (name -> value). 
+    @return The source code of the specialized shader. 
+    """
+    if not defines:
+        return shader_code
+    lines = shader_code.split("\n")
+    index = next((i + 1 for i, line in enumerate(lines) if line.lstrip().startswith("#version")), 0)
+    lines[index:index] = [f"#define {name} {value}" for name, value in sorted(defines.items())]
+    return "\n".join(lines)
+
+@functools.lru_cache(maxsize=None)
+def _compile_shader(shader_code: str, shader_type: int) -> int:
+    """
+    @fn _compile_shader()
+    @brief Compile shader script, memoized across Viewer instances. 
+    @param shader_code The source code of the shader. 
+    @param shader_type The type of the shader (e.g. GL_VERTEX_SHADER). 
+    @return The ID of the shader, or 0 on failure (only detected here when debugging). 
+    @note Querying the result waits for the compiler, so compile errors are otherwise detected when the program fails to link (see Viewer.load_or_build_program()). 
+    @note The shader is only valid in the contexts sharing objects with _share_window. 
+    """
+    shader_id = gl.glCreateShader(shader_type)
+    gl.glShaderSource(shader_id, [shader_code])
+    gl.glCompileShader(shader_id)
+    if DEBUG and not Viewer.check_shader(shader_id):
+        gl.glDeleteShader(shader_id)
+        return 0
+    return shader_id
+
+def _pack_vertices(model_vertices: typing.Union[np.ndarray, typing.List[float]], model_uvmap: typing.Union[np.ndarray, typing.List[float]], vertex_dtype: np.dtype) -> typing.Optional[np.ndarray]:
+    """
+    @fn _pack_vertices()
+    @brief Interleave the positions and the uv coordinates as [X, Y, Z, U, V] per vertex. 
+    @param model_vertices The list of vertices in the model. 
+    @param model_uvmap The uvmapping which associate model_vertices with textures. 
+    @param vertex_dtype The layout of a vertex, with the fields "position" and "uv". 
+    @return The array of the vertices, or None if the lengths of the lists do not match. 
+    @note The uvs are quantized when they are stored as normalized 16-bit integers. 
+    """
+    vertex_positions = np.asarray(model_vertices, dtype=np.float32).ravel()
+    vertex_uvs = np.asarray(model_uvmap, dtype=np.float32).ravel()
+    if vertex_positions.size % 3 != 0 or vertex_uvs.size != vertex_positions.size // 3 * 2:
+        logger.error("[Viewer Error] model_vertices (%d values) and model_uvmap (%d values) must have 3 and 2 values per vertex. ", 
+                vertex_positions.size, vertex_uvs.size)
+        return None
+    vertex_positions = vertex_positions.reshape(-1, 3)
+    vertex_uvs = vertex_uvs.reshape(-1, 2)
+    vertex_array = np.zeros(len(vertex_positions), dtype=vertex_dtype)
+    vertex_array["position"][:, :3] = vertex_positions
+    if vertex_dtype["uv"].base == np.uint16:
+        vertex_uvs = np.round(np.clip(vertex_uvs, 0., 1.) * 65535.)
+    vertex_array["uv"] = vertex_uvs
+    return vertex_array
+
+def _gl_version() -> typing.Tuple[int, int]:
+    """
+    @fn _gl_version()
+    @brief Get the version of the current OpenGL context. 
+    @return The version (major, minor). 
+    @note Whether a function is supported has to be decided by the version: GLX resolves every function name, so the function pointers are never null. 
+    """
+    return (int(gl.glGetIntegerv(gl.GL_MAJOR_VERSION)), int(gl.glGetIntegerv(gl.GL_MINOR_VERSION)))
+
+def _import_cudart() -> typing.Any:
+    """
+    @fn _import_cudart()
+    @brief Import the CUDA runtime API of cuda-python, which is an optional dependency. 
+    @return The module, or None if cuda-python is not installed. 
+    """
+    try:
+        from cuda.bindings import runtime as cudart
+    except ImportError:
+        try:
+            from cuda import cudart
+        except ImportError:
+            return None
+    return cudart
+
+def _rotate(angle: float, axis) -> np.ndarray:
+    """
+    @fn _rotate()
+    @brief Make a rotation matrix. 
+    @param angle The rotation angle in radians. 
+    @param axis The rotation axis (x, y, z). It does not have to be normalized. 
+    @return The 4x4 matrix in row-major order. 
+    """
+    x, y, z = np.asarray((axis[0], axis[1], axis[2]), dtype=np.float64) / np.linalg.norm((axis[0], axis[1], axis[2]))
+    c, s = np.cos(angle), np.sin(angle)
+    matrix = np.identity(4, dtype=np.float32)
+    matrix[:3, :3] = c * np.identity(3) + s * np.array([[0., -z, y], [z, 0., -x], [-y, x, 0.]]) \
+            + (1. - c) * np.outer((x, y, z), (x, y, z))
+    return matrix
+
+def _scale(s: float) -> np.ndarray:
+    """
+    @fn _scale()
+    @brief Make a uniform scaling matrix. 
+    @param s The scale factor. 
+    @return The 4x4 matrix in row-major order. 
+    """
+    return np.diag(np.array((s, s, s, 1.), dtype=np.float32))
+
+def _trs(t, r) -> np.ndarray:
+    """
+    @fn _trs()
+    @brief Make the matrix which rotates around x, y and z axes in this order and then translates. 
+    @param t The translation (x, y, z). 
+    @param r The rotation angles around x, y and z axes in radians. 
+    @return The 4x4 matrix (T * Rx * Ry * Rz) in row-major order. 
+    """
+    cx, cy, cz = np.cos((r[0], r[1], r[2]))
+    sx, sy, sz = np.sin((r[0], r[1], r[2]))
+    return np.array([
+        [cy * cz, -cy * sz, sy, t[0]], 
+        [sx * sy * cz + cx * sz, -sx * sy * sz + cx * cz, -sx * cy, t[1]], 
+        [-cx * sy * cz + sx * sz, cx * sy * sz + sx * cz, cx * cy, t[2]], 
+        [0., 0., 0., 1.]], dtype=np.float32)
+
+def _perspective(field_of_view: float, width: float, height: float, near: float, far: float) -> np.ndarray:
+    """
+    @fn _perspective()
+    @brief Make a left-handed perspective projection matrix which maps the depth to [-1, 1] (as glm.perspectiveFovLH_NO()). 
+    @param field_of_view The vertical field of view in radians. 
+    @param width The width of the viewport. 
+    @param height The height of the viewport. 
+    @param near The distance to the near clipping plane. 
+    @param far The distance to the far clipping plane. 
+    @return The 4x4 matrix in row-major order. 
+    """
+    h = 1. / np.tan(0.5 * field_of_view)
+    w = h * height / width
+    return np.array([
+        [w, 0., 0., 0.], 
+        [0., h, 0., 0.], 
+        [0., 0., (far + near) / (far - near), -2. * far * near / (far - near)], 
+        [0., 0., 1., 0.]], dtype=np.float32)
+
+class ResourceCache:
+    """
+    @class ResourceCache
+    @brief A refcounted table of OpenGL objects shared by the viewers. 
+    @detail The objects are keyed by their contents, so that the viewers with the same contents share one object. 
+    @note The objects are only valid in the contexts sharing objects with _share_window. 
+    """
+
+    """
+    @var entries
+    @brief The list of [object ID, refcount] for each key. 
+    """
+    entries: typing.Dict[typing.Hashable, typing.List[int]]
+
+    """
+    @var keys
+    @brief The key of each object ID. 
+    """
+    keys: typing.Dict[int, typing.Hashable]
+
+    """
+    @var delete
+    @brief The function which deletes an object. 
+    """
+    delete: typing.Callable[[int], None]
+
+    def __init__(self, delete: typing.Callable[[int], None]):
+        """
+        @fn __init__()
+        @brief Initialization of the cache. 
+        @param delete The function which deletes an object. 
+        """
+        self.entries = {}
+        self.keys = {}
+        self.delete = delete
+
+    def acquire(self, key: typing.Hashable, create: typing.Callable[[], int]) -> int:
+        """
+        @fn acquire()
+        @brief Get the object for the key, creating it if there is none. 
+        @param key The key of the contents of the object. 
+        @param create The function which creates the object. It returns 0 on failure. 
+        @return The ID of the object, or 0 on failure. 
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            object_id = create()
+            if object_id == 0:
+                return 0
+            entry = self.entries[key] = [object_id, 0]
+            self.keys[object_id] = key
+        entry[1] += 1
+        return entry[0]
+
+    def release(self, object_id: int):
+        """
+        @fn release()
+        @brief Release an object acquired with acquire(). It is deleted when no viewer uses it. 
+        @param object_id The ID of the object. 
+        """
+        key = self.keys[object_id]
+        entry = self.entries[key]
+        entry[1] -= 1
+        if entry[1] == 0:
+            self.delete(object_id)
+            del self.entries[key]
+            del self.keys[object_id]
+
+    def clear(self):
+        """
+        @fn clear()
+        @brief Forget all the objects without deleting them, e.g. after their contexts are destroyed. 
+        """
+        self.entries.clear()
+        self.keys.clear()
+
+"""
+@var _program_cache
+@brief The shader programs shared by the viewers, keyed by the sources of the shaders. 
+"""
+_program_cache = ResourceCache(gl.glDeleteProgram)
+
+"""
+@var _program_users
+@brief The viewer whose camera matrices are in the uniforms of each shared program (program -> viewer). 
+"""
+_program_users: typing.Dict[int, typing.Any] = {}
+
+"""
+@var _buffer_cache
+@brief The vertex buffers shared by the viewers, keyed by the hash of the vertices. 
+"""
+_buffer_cache = ResourceCache(lambda buffer: gl.glDeleteBuffers(1, [buffer]))
+
 @dataclasses.dataclass
 class CameraProperty:
-    transform_matrix: glm.mat4
+    transform_matrix: np.ndarray
     clipping_distance: glm.vec2
     field_of_view: float
 
@@ -20,7 +412,7 @@ class CameraProperty:
         @brief Make a deep copy of an instance. 
         """
         return CameraProperty(
-                transform_matrix = glm.mat4(self.transform_matrix), 
+                transform_matrix = self.transform_matrix.copy(), 
                 clipping_distance = glm.vec2(self.clipping_distance), 
                 field_of_view = self.field_of_view)
 
@@ -36,6 +428,25 @@ class Viewer:
     @detail This class renders the model specified in the argument of constructor as model_vertices and mode_uvmap. 
     """
 
+    # The instance variables are fixed so that they are read from slots instead of the instance dictionary every frame. 
+    __slots__ = (
+            "window", "window_size", "gl_version", 
+            "camera_property", "default_camera_property", "camera_dirty", "perspective_matrix", "perspective_dirty", 
+            "previous_cursor_status", "key_states", "camera_key_states", 
+            "vertex_buffer", "va_object", "vertex_count", "vertex_dtype", "vertex_attributes", 
+            "vertex_ring_buffer", "vertex_ring_views", "vertex_fences", "vertex_ring_index", 
+            "strip_firsts", "strip_counts", "indirect_buffer", 
+            "index_buffer", "index_count", "index_type", 
+            "texture", "texture_size", "texture_pbo", "texture_pbo_views", "texture_fences", "texture_ring_index", 
+            "cuda_pbo", "cuda_resource", 
+            "shader_program", "projection_location", "view_location", "sampler_location", 
+            "poll_mode", "poll_budget", "needs_redraw", 
+            # Functions called every frame, bound once to skip the module attribute lookups
+            "_glClear", 
+            "_glDrawArrays", "_glDrawElements", "_glMultiDrawArrays", "_glMultiDrawArraysIndirect", 
+            "_glUniformMatrix4fv", 
+            "_get_current_context", "_get_mouse_button", "_get_cursor_pos", "_swap_buffers", "_poll_events", "_wait_events", "_wait_events_timeout", "_window_should_close")
+
     """
     @var window
     @brief The window object of GLFW. 
@@ -60,6 +471,42 @@ class Viewer:
     """
     default_camera_property: CameraProperty
 
+    """
+    @var camera_dirty
+    @brief Whether the camera transform has changed since the view matrix was uploaded last. 
+    """
+    camera_dirty: bool
+
+    """
+    @var perspective_matrix
+    @brief The projection matrix of the camera, which only changes with the window size and the camera properties. 
+    """
+    perspective_matrix: np.ndarray
+
+    """
+    @var perspective_dirty
+    @brief Whether perspective_matrix has changed since it was uploaded last. 
+    """
+    perspective_dirty: bool
+
+    """
+    @var key_states
+    @brief Whether each key is held down, updated by key_callback() (key -> pressed). 
+    """
+    key_states: typing.Dict[int, bool]
+
+    """
+    @var camera_key_states
+    @brief Whether each key of CAMERA_KEYS is held down (1 or 0), updated by key_callback(). 
+    """
+    camera_key_states: np.ndarray
+
+    """
+    @var vertex_buffer
+    @brief The ID of the buffer which stores the interleaved model_vertices and model_uvmap. 
+    """
+    vertex_buffer: int
+
     """
     @var va_object
     @brief The vertext array object of OpenGL which stores model_vertices and model_uvmap. 
@@ -78,6 +525,169 @@ class Viewer:
     """
     shader_program: int
 
+    """
+    @var gl_version
+    @brief The version of the OpenGL context (major, minor). 
+    """
+    gl_version: typing.Tuple[int, int]
+
+    """
+    @var texture_size
+    @brief The size of the texture (width, height). 
+    """
+    texture_size: typing.Tuple[int, int]
+
+    """
+    @var texture_pbo
+    @brief The ID of the persistently mapped pixel buffer object used by update_texture(), or None before the first update. 
+    """
+    texture_pbo: typing.Optional[int]
+
+    """
+    @var texture_pbo_views
+    @brief The numpy views of the mapped regions of texture_pbo. 
+    """
+    texture_pbo_views: typing.List[np.ndarray]
+
+    """
+    @var texture_fences
+    @brief The fences signaled when the GPU finished reading each region of texture_pbo. 
+    """
+    texture_fences: typing.List[typing.Any]
+
+    """
+    @var texture_ring_index
+    @brief The region of texture_pbo written by the next update_texture(). 
+    """
+    texture_ring_index: int
+
+    """
+    @var cuda_pbo
+    @brief The ID of the pixel buffer object shared with CUDA, or None before the first CUDA update. 
+    """
+    cuda_pbo: typing.Optional[int]
+
+    """
+    @var cuda_resource
+    @brief The CUDA graphics resource registered for cuda_pbo. 
+    """
+    cuda_resource: typing.Any
+
+    """
+    @var vertex_count
+    @brief The number of vertices in the model. 
+    """
+    vertex_count: int
+
+    """
+    @var vertex_dtype
+    @brief The layout of a vertex in vertex_buffer. 
+    """
+    vertex_dtype: np.dtype
+
+    """
+    @var vertex_attributes
+    @brief The vertex attributes as (index, the number of components, type, normalized, offset in a vertex). 
+    """
+    vertex_attributes: typing.List[typing.Tuple[int, int, int, int, int]]
+
+    """
+    @var vertex_ring_buffer
+    @brief The buffer written by update_vertices(), or None until it is called. 
+    @detail With glBufferStorage (OpenGL 4.4) it is persistently mapped and holds VERTEX_RING_SIZE regions. 
+    """
+    vertex_ring_buffer: typing.Optional[int]
+
+    """
+    @var vertex_ring_views
+    @brief The arrays of vertices mapped onto each region of vertex_ring_buffer. 
+    """
+    vertex_ring_views: typing.List[np.ndarray]
+
+    """
+    @var vertex_fences
+    @brief The fences signaled when the GPU has finished drawing from each region of vertex_ring_buffer. 
+    """
+    vertex_fences: typing.List[typing.Any]
+
+    """
+    @var vertex_ring_index
+    @brief The region of vertex_ring_buffer drawn from. 
+    """
+    vertex_ring_index: int
+
+    """
+    @var strip_firsts
+    @brief The first vertex of each triangle strip, or None when the model is a single strip. 
+    """
+    strip_firsts: typing.Optional[np.ndarray]
+
+    """
+    @var strip_counts
+    @brief The number of vertices of each triangle strip, or None when the model is a single strip. 
+    """
+    strip_counts: typing.Optional[np.ndarray]
+
+    """
+    @var indirect_buffer
+    @brief The ID of the buffer which stores the draw commands of the strips, or None without glMultiDrawArraysIndirect (OpenGL < 4.3). 
+    """
+    indirect_buffer: typing.Optional[int]
+
+    """
+    @var index_buffer
+    @brief The ID of the buffer which stores the indices of the triangles, or None when the model is drawn as triangle strips. 
+    """
+    index_buffer: typing.Optional[int]
+
+    """
+    @var index_count
+    @brief The number of indices in index_buffer. 
+    """
+    index_count: int
+
+    """
+    @var index_type
+    @brief The type of the indices in index_buffer (GL_UNSIGNED_SHORT or GL_UNSIGNED_INT). 
+    """
+    index_type: int
+
+    """
+    @var projection_location
+    @brief The location of the uniform variable projection_matrix in the shader program. 
+    """
+    projection_location: int
+
+    """
+    @var view_location
+    @brief The location of the uniform variable view_matrix in the shader program. 
+    """
+    view_location: int
+
+    """
+    @var sampler_location
+    @brief The location of the uniform variable sampler in the shader program. 
+    """
+    sampler_location: int
+
+    """
+    @var poll_mode
+    @brief How update() processes window events ("auto", "poll", "wait" or "wait_timeout"). 
+    """
+    poll_mode: str
+
+    """
+    @var poll_budget
+    @brief The maximum time in seconds update() waits for events in "wait_timeout" mode. 
+    """
+    poll_budget: float
+
+    """
+    @var needs_redraw
+    @brief Whether the frame has to be drawn again, because the camera, the texture or the window has changed. 
+    """
+    needs_redraw: bool
+
     @staticmethod
     def on_error(code: int, message: str):
         """
@@ -86,28 +696,152 @@ class Viewer:
         @param code Error code. 
         @param message Error message. 
         """
-        print(f"[GLFW Error] {message} ({code})")
+        logger.error("[GLFW Error] %s (%s)", message, code)
+
+    @staticmethod
+    def compile_shader(shader_id: int, shader_code: str) -> bool:
+        """
+        @fn compile_shader()
+        @brief Compile shader script. 
+        @param shader_id The ID of the shader to be compiled. 
+        @param shader_code The source code of the shader. 
+        @return Whether the compilation succeeded. 
+        """
+        gl.glShaderSource(shader_id, [shader_code])
+        gl.glCompileShader(shader_id)
+        return Viewer.check_shader(shader_id)
+
+    @staticmethod
+    def check_shader(shader_id: int) -> bool:
+        """
+        @fn check_shader()
+        @brief Check whether the shader has been compiled successfully, and print the error if not. 
+        @param shader_id The ID of the shader. 
+        @return Whether the compilation succeeded. 
+        """
+        result = gl.glGetShaderiv(shader_id, gl.GL_COMPILE_STATUS)
+        if result != gl.GL_TRUE:
+            logger.error("[GLFW Error] %s", gl.glGetShaderInfoLog(shader_id))
+            return False
+
+        return True
 
     @staticmethod
     def load_shader(shader_id: int, filename: str) -> bool:
         """
         @fn load_shader()
-        @brief Load shader script from a file. 
-        @param shader_id The ID of the shader to which the texture should be bound. 
+        @brief Load shader script from a file and compile it. 
+        @param shader_id The ID of the shader to be compiled. 
         @param filename The filename of a shader file. 
         @return Whether the loading succeeded. 
         """
-        with open(filename) as shader_file:
-            shader_code = shader_file.read()
-            gl.glShaderSource(shader_id, [shader_code])
-            gl.glCompileShader(shader_id)
+        return Viewer.compile_shader(shader_id, _read_shader_source(filename, os.path.getmtime(filename)))
 
-            result = gl.glGetShaderiv(shader_id, gl.GL_COMPILE_STATUS)
-            if result != gl.GL_TRUE:
-                print(f"[GLFW Error] {gl.glGetShaderInfoLog(shader_id)}")
-                return False
+    @staticmethod
+    def load_or_build_program(vs_path: str, fs_path: str, 
+            defines: typing.Optional[typing.Dict[str, str]] = None) -> int:
+        """
+        @fn load_or_build_program()
+        @brief Create a shader program, reusing the program binary cached on disk if possible. 
+        @param vs_path The filename of the vertex shader file. 
+        @param fs_path The filename of the fragment shader file. 
+        @param defines The macros to define in both shaders (see _specialize_shader()). 
+        @return The ID of the linked shader program, or 0 on failure. 
+        @detail The cache is keyed by the specialized shader sources and the vendor, renderer and version strings of the driver. 
+        @detail The cache is skipped when the driver supports no program binary format. 
+        """
+        vs_code = _specialize_shader(_read_shader_source(vs_path, os.path.getmtime(vs_path)), defines)
+        fs_code = _specialize_shader(_read_shader_source(fs_path, os.path.getmtime(fs_path)), defines)
+
+        use_cache = _gl_version() >= (4, 1) \
+                and gl.glGetIntegerv(gl.GL_NUM_PROGRAM_BINARY_FORMATS) > 0
+        if use_cache:
+            key = hashlib.blake2b()
+            for item in (vs_code.encode(), fs_code.encode(), 
+                    gl.glGetString(gl.GL_VENDOR), 
+                    gl.glGetString(gl.GL_RENDERER), 
+                    gl.glGetString(gl.GL_VERSION)):
+                key.update((item or b"") + b"\0")
+            cache_path = os.path.join(SHADER_CACHE_DIR, f"{key.hexdigest()}.bin")
+
+            # Try the cached binary
+            try:
+                with open(cache_path, "rb") as cache_file:
+                    data = cache_file.read()
+            except OSError:
+                data = None
+
+            if data is not None and len(data) > 4:
+                program = gl.glCreateProgram()
+                binary = np.frombuffer(data, dtype=np.uint8, offset=4)
+                try:
+                    gl.glProgramBinary(program, int.from_bytes(data[:4], "little"), binary, binary.size)
+                    is_linked = gl.glGetProgramiv(program, gl.GL_LINK_STATUS) == gl.GL_TRUE
+                except gl.GLError:
+                    is_linked = False
+
+                if is_linked:
+                    return program
+                # The driver rejected the binary (e.g. after an update). Rebuild it. 
+                gl.glDeleteProgram(program)
+
+        # Compile shaders
+        vert_shader = _compile_shader(vs_code, gl.GL_VERTEX_SHADER)
+        frag_shader = _compile_shader(fs_code, gl.GL_FRAGMENT_SHADER)
+        if vert_shader == 0 or frag_shader == 0:
+            return 0
 
-        return True
+        # Create shader program
+        program = gl.glCreateProgram()
+        if use_cache:
+            gl.glProgramParameteri(program, gl.GL_PROGRAM_BINARY_RETRIEVABLE_HINT, gl.GL_TRUE)
+
+        # Bind shader objects
+        # The shaders are memoized, so detach them after linking instead of deleting them. 
+        gl.glAttachShader(program, vert_shader)
+        gl.glAttachShader(program, frag_shader)
+
+        # Link shader program
+        gl.glLinkProgram(program)
+        gl.glDetachShader(program, vert_shader)
+        gl.glDetachShader(program, frag_shader)
+        result = gl.glGetProgramiv(program, gl.GL_LINK_STATUS)
+        if result != gl.GL_TRUE:
+            # The compile status of the shaders is only queried now (see _compile_shader())
+            is_compiled = Viewer.check_shader(vert_shader) & Viewer.check_shader(frag_shader)
+            logger.error("[GLFW Error] Shader link failed: %s", gl.glGetProgramInfoLog(program))
+            gl.glDeleteProgram(program)
+            if not is_compiled:
+                # Do not keep the broken shaders memoized. The other shaders are compiled again when needed and released when GLFW is terminated. 
+                gl.glDeleteShader(vert_shader)
+                gl.glDeleteShader(frag_shader)
+                _compile_shader.cache_clear()
+            return 0
+
+        # Store the binary. Write to a temporary file first so that a concurrent reader never sees a partial file. 
+        if use_cache:
+            length = gl.glGetProgramiv(program, gl.GL_PROGRAM_BINARY_LENGTH)
+            binary_length = np.zeros(1, dtype=np.int32)
+            binary_format = np.zeros(1, dtype=np.uint32)
+            binary = np.empty(length, dtype=np.uint8)
+            gl.glGetProgramBinary(program, length, binary_length, binary_format, binary)
+            tmp_path = None
+            try:
+                os.makedirs(SHADER_CACHE_DIR, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=SHADER_CACHE_DIR)
+                with os.fdopen(fd, "wb") as tmp_file:
+                    tmp_file.write(int(binary_format[0]).to_bytes(4, "little"))
+                    tmp_file.write(binary[:binary_length[0]].tobytes())
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                # Do not leave a partial file behind
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+
+        return program
 
     @staticmethod
     def help():
@@ -131,25 +865,39 @@ class Viewer:
         print(":================================:")
         print()
 
-    def update_camera_matrix(self):
+    def update_perspective_matrix(self):
         """
-        @fn update_camera_matrix()
-        @brief Calculate MVP matrix and upload it to GPU. 
+        @fn update_perspective_matrix()
+        @brief Calculate the perspective matrix. 
+        @note Call this after changing the field of view or the clipping distance of camera_property. 
         """
-        # Calculate the perspective matrix
-        perspective_matrix = glm.perspectiveFovLH_NO(
-                glm.radians(self.camera_property.field_of_view), 
+        self.perspective_matrix = _perspective(
+                np.radians(self.camera_property.field_of_view), 
                 self.window_size[0], self.window_size[1], 
                 self.camera_property.clipping_distance[0], 
                 self.camera_property.clipping_distance[1])
+        self.perspective_dirty = True
 
-        # Compose MVP matrix
-        mvp_matrix = perspective_matrix * self.camera_property.transform_matrix
-
-        # Upload to uniform variable in the shader
-        gl.glUseProgram(self.shader_program)
-        gl.glUniformMatrix4fv(gl.glGetUniformLocation(self.shader_program, "mvp_matrix"), 
-                1, gl.GL_FALSE, glm.value_ptr(mvp_matrix))
+    def update_camera_matrix(self):
+        """
+        @fn update_camera_matrix()
+        @brief Upload the camera matrices which have changed to GPU. 
+        @detail The projection and the view matrices are multiplied in the vertex shader. 
+        @note The shader program is bound for good in __init__(). 
+        """
+        # The viewers sharing the program share its uniforms, so upload both matrices after another viewer has
+        if _program_users.get(self.shader_program) is not self:
+            _program_users[self.shader_program] = self
+            self.perspective_dirty = self.camera_dirty = True
+
+        # Upload to uniform variables in the shader (numpy arrays are row-major)
+        for location, matrix, is_dirty in (
+                (self.projection_location, self.perspective_matrix, self.perspective_dirty), 
+                (self.view_location, self.camera_property.transform_matrix, self.camera_dirty)):
+            if is_dirty:
+                self._glUniformMatrix4fv(location, 1, _GL_TRUE, matrix)
+        self.perspective_dirty = False
+        self.camera_dirty = False
 
     def window_size_callback(self, window: glfw._GLFWwindow, new_width: int, new_height: int):
         """
@@ -161,9 +909,36 @@ class Viewer:
         """
         # For the support of retina display, use the framebuffer size instead of the window size. 
         self.window_size = glfw.get_framebuffer_size(self.window)
-        self.update_camera_matrix()
+        self.update_perspective_matrix()
+
+        # The events of every window are processed in whichever viewer's update(), so another context may be current
+        self._make_current()
         gl.glViewport(0, 0, new_width, new_height)
 
+    def window_refresh_callback(self, window: glfw._GLFWwindow):
+        """
+        @fn window_refresh_callback()
+        @brief The callback function for glfw.set_window_refresh_callback(). 
+        @param window The ID of the window whose contents need to be redrawn (e.g. after being uncovered). 
+        """
+        self.needs_redraw = True
+
+    def key_callback(self, window: glfw._GLFWwindow, key: int, scancode: int, action: int, mods: int):
+        """
+        @fn key_callback()
+        @brief The callback function for glfw.set_key_callback(). 
+        @param window The ID of the window which receives the event. 
+        @param key The key which is pressed or released. 
+        @param scancode The system-specific scancode of the key. 
+        @param action The action (PRESS, RELEASE or REPEAT). 
+        @param mods The modifier keys held down. 
+        """
+        is_pressed = action != glfw.RELEASE
+        self.key_states[key] = is_pressed
+        index = _camera_key_index.get(key)
+        if index is not None:
+            self.camera_key_states[index] = is_pressed
+
     def mouse_scroll_callback(self, window: glfw._GLFWwindow, x_offset: float, y_offset: float):
         """
         @fn mouse_scroll_callback()
@@ -174,11 +949,11 @@ class Viewer:
         """
         if y_offset != 0.:
             if y_offset > 0.:
-                tmat = glm.scale(glm.mat4(1.), glm.vec3(1.25))
+                tmat = _scale(1.25)
             else:
-                tmat = glm.scale(glm.mat4(1.), glm.vec3(0.8))
-            self.camera_property.transform_matrix = self.camera_property.transform_matrix * tmat
-            self.update_camera_matrix()
+                tmat = _scale(0.8)
+            self.camera_property.transform_matrix = self.camera_property.transform_matrix @ tmat
+            self.camera_dirty = True
 
     def display_all_instance_variables(self):
         """
@@ -186,10 +961,74 @@ class Viewer:
         @brief For developpers. List up all the instance variables. 
         """
         print(" ==== Instance Variables in Viewer ==== ")
-        [print(f"{key}: {type(val)}") for key, val in vars(self).items()]
+        [print(f"{key}: {type(getattr(self, key, None))}") for key in Viewer.__slots__]
         print(" ====================================== ")
 
-    def __init__(self, model_vertices: typing.List[float], model_uvmap: typing.List[float], texture_filename: str, window_title: str):
+    def _make_current(self):
+        """
+        @fn _make_current()
+        @brief Make the context of the viewer current, unless it already is. 
+        @note Updating or closing the other viewers leaves their own contexts current. 
+        """
+        # The windows are ctypes pointers, which only compare equal by address
+        current = ctypes.cast(self._get_current_context(), ctypes.c_void_p).value
+        if current != ctypes.cast(self.window, ctypes.c_void_p).value:
+            glfw.make_context_current(self.window)
+
+    def _point_vertex_attributes(self, buffer: int, offset: int):
+        """
+        @fn _point_vertex_attributes()
+        @brief Let the vertex array read the vertices from a buffer. 
+        @param buffer The ID of the buffer. 
+        @param offset The offset of the first vertex in the buffer in bytes. 
+        @note Without direct state access (OpenGL < 4.5) the vertex array must be bound. 
+        """
+        stride = self.vertex_dtype.itemsize
+        if self.gl_version >= (4, 5):
+            gl.glVertexArrayVertexBuffer(self.va_object, 0, buffer, offset, stride)
+        else:
+            # GL_ARRAY_BUFFER is not a part of the vertex array state, so it is only bound while the pointers are set. 
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, buffer)
+            for index, size, data_type, normalized, attribute_offset in self.vertex_attributes:
+                gl.glVertexAttribPointer(index, size, data_type, normalized, stride, 
+                        ctypes.c_void_p(offset + attribute_offset))
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+
+    def _create_static_buffer(self, array: np.ndarray) -> int:
+        """
+        @fn _create_static_buffer()
+        @brief Create a buffer and upload an array which is never modified (e.g. the vertices) to it. 
+        @param array The contents of the buffer. 
+        @return The ID of the buffer. 
+        """
+        if self.gl_version >= (4, 5):
+            # Create & allocate buffer with direct state access (OpenGL 4.5)
+            handles = np.zeros(1, dtype=np.uint32)
+            gl.glCreateBuffers(1, handles)
+            buffer = int(handles[0])
+            gl.glNamedBufferStorage(buffer, array.nbytes, array, 0)
+        else:
+            # Generate & bind buffer
+            buffer = gl.glGenBuffers(1)
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, buffer)
+
+            # Allocate memory. The contents are never modified, so hint the driver to keep them in video memory. 
+            gl.glBufferData(gl.GL_ARRAY_BUFFER, array.nbytes, array, gl.GL_STATIC_DRAW)
+
+        # Querying the buffer forces a sync with the driver, so the allocation is only verified when debugging. 
+        if DEBUG:
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, buffer)
+            size_expected = array.nbytes
+            size_allocated = gl.glGetBufferParameteriv(gl.GL_ARRAY_BUFFER, gl.GL_BUFFER_SIZE)
+
+            if size_allocated != size_expected:
+                logger.error("[GL Error] Failed to allocate memory for buffer. ")
+                gl.glDeleteBuffers(1, [buffer])
+                sys.exit()
+
+        return buffer
+
+    def __init__(self, model_vertices: typing.Union[np.ndarray, typing.List[float]], model_uvmap: typing.Union[np.ndarray, typing.List[float]], texture_filename: str, window_title: str, poll_mode: str = "auto", precision: str = "f32", model_strips: typing.Optional[typing.List[typing.Tuple[int, int]]] = None, model_indices: typing.Optional[typing.Union[np.ndarray, typing.List[int]]] = None):
         """
         @fn __init__()
         @brief Initialization of viewer.  
@@ -197,19 +1036,62 @@ class Viewer:
         @param model_uvmap the uvmapping which associate model_vertices with textures
         @param texture_filename The path to the texture file. 
         @param window_title The title of the window. 
+        @param poll_mode How update() processes window events: "auto", "poll", "wait" or "wait_timeout". 
+        @param precision The precision of the vertex buffer: "f32" or "f16". 
+        @param model_strips The list of (first vertex, the number of vertices) of each triangle strip, when model_vertices contains several strips. 
+        @param model_indices The list of the vertex indices of each triangle [A1, B1, C1, A2, ...], to draw the model as indexed triangles instead of strips. 
         @note The format of model_vertices is [X1, Y1, Z1, X2, Y2, ...]. 
         @note The format of model_uvmap is [U1, V1, U2, V2, ...]. 
+        @note model_vertices and model_uvmap are preferably float32 numpy arrays, which are read without conversion. 
+        @note "poll" returns immediately, "wait" sleeps until an event arrives and "wait_timeout" sleeps for at most poll_budget seconds. 
+        @note "auto" polls after drawing a frame and otherwise sleeps for at most IDLE_TIMEOUT seconds, so an idle viewer does not spin. 
+        @note "auto" and "wait_timeout" require GLFW 3.2 or later. 
+        @note "f16" stores positions as half floats and uvs as normalized 16-bit integers, halving the vertex buffer. The uvs must be in [0, 1]. 
+        @note The strips in model_strips are drawn with a single draw call. If it is None, all the vertices form one strip. 
+        @note Indexed triangles let the GPU reuse the vertices shared by triangles. model_strips and model_indices are exclusive. 
         """
+        global _share_window, _glfw_refcount
         print("Initializing Viewer...")
 
-        # set callback function on error
-        glfw.set_error_callback(Viewer.on_error)
+        self._glClear = gl.glClear
+        self._glDrawArrays = gl.glDrawArrays
+        self._glDrawElements = gl.glDrawElements
+        self._glMultiDrawArrays = gl.glMultiDrawArrays
+        self._glMultiDrawArraysIndirect = gl.glMultiDrawArraysIndirect
+        self._glUniformMatrix4fv = gl.glUniformMatrix4fv
+        self._get_current_context = glfw.get_current_context
+        self._get_mouse_button = glfw.get_mouse_button
+        self._get_cursor_pos = glfw.get_cursor_pos
+        self._swap_buffers = glfw.swap_buffers
+        self._poll_events = glfw.poll_events
+        self._wait_events = glfw.wait_events
+        # glfw only defines wait_events_timeout() with GLFW 3.2 or later
+        self._wait_events_timeout = getattr(glfw, "wait_events_timeout", None)
+        self._window_should_close = glfw.window_should_close
+
+        if poll_mode not in ("auto", "poll", "wait", "wait_timeout"):
+            logger.error("[Viewer Error] Unknown poll mode: %s", poll_mode)
+            sys.exit()
+        if poll_mode in ("auto", "wait_timeout") and self._wait_events_timeout is None:
+            logger.error("[Viewer Error] The poll mode %s requires GLFW 3.2 or later. Use \"poll\" or \"wait\" instead. ", poll_mode)
+            sys.exit()
+        self.poll_mode = poll_mode
+        self.poll_budget = 0.001
 
-        # Initialize
-        if glfw.init() != gl.GL_TRUE:
-            print("[GLFW Error] Failed to initialize GLFW. ")
+        if precision not in ("f32", "f16"):
+            logger.error("[Viewer Error] Unknown precision: %s", precision)
             sys.exit()
 
+        # Initialize GLFW once for all the viewers
+        if _glfw_refcount == 0:
+            # set callback function on error
+            glfw.set_error_callback(Viewer.on_error)
+
+            if glfw.init() != gl.GL_TRUE:
+                logger.error("[GLFW Error] Failed to initialize GLFW. ")
+                sys.exit()
+        _glfw_refcount += 1
+
         #========================================
         # Prepare Window
         #========================================
@@ -218,6 +1100,9 @@ class Viewer:
         glfw.window_hint(glfw.CONTEXT_VERSION_MAJOR, 3)
         glfw.window_hint(glfw.CONTEXT_VERSION_MINOR, 3)
         glfw.window_hint(glfw.OPENGL_FORWARD_COMPAT, True)
+        # Core profile contexts are created with the highest version the driver supports, 
+        # so the direct state access functions (OpenGL 4.5) are used where they are available. 
+        glfw.window_hint(glfw.OPENGL_PROFILE, glfw.OPENGL_CORE_PROFILE)
 
         # Create window
         self.window_size = (640, 480)
@@ -226,14 +1111,17 @@ class Viewer:
                 self.window_size[1],  # height
                 window_title,  # window title
                 None, 
-                None)
+                _share_window)  # share GL objects (shaders, buffers, textures) with the other viewers
 
         if self.window == None:
-            print("[GLFW Error] Failed to Create a window. ")
+            logger.error("[GLFW Error] Failed to Create a window. ")
             sys.exit()
 
         # Create OpenGL context
         glfw.make_context_current(self.window)
+        self.gl_version = _gl_version()
+        if _share_window is None:
+            _share_window = self.window
 
         # Set background color.
         gl.glClearColor(0.0, 1.0, 1.0, 1.0)
@@ -241,7 +1129,11 @@ class Viewer:
         #gl.glViewport(0, 0, 480, 480)
 
         # Set callback functions
+        self.key_states = {}
+        self.camera_key_states = np.zeros(len(CAMERA_KEYS), dtype=np.float32)
         glfw.set_window_size_callback(self.window, self.window_size_callback)
+        glfw.set_window_refresh_callback(self.window, self.window_refresh_callback)
+        glfw.set_key_callback(self.window, self.key_callback)
         glfw.set_scroll_callback(self.window, self.mouse_scroll_callback)
 
         #========================================
@@ -249,50 +1141,102 @@ class Viewer:
         #========================================
         print("- Preparing buffers.")
         # --- Vertex buffer ---
-        # Generate & bind buffer
-        vertex_buffer = gl.glGenBuffers(1)
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, vertex_buffer)
-
-        # Allocate memory
-        c_vertex_buffer = (ctypes.c_float*len(model_vertices))(*model_vertices)
-        gl.glBufferData(gl.GL_ARRAY_BUFFER, c_vertex_buffer, gl.GL_DYNAMIC_DRAW)
-        size_expected = ctypes.sizeof(ctypes.c_float) * len(model_vertices)
-        size_allocated = gl.glGetBufferParameteriv(gl.GL_ARRAY_BUFFER, gl.GL_BUFFER_SIZE)
-
-        if size_allocated != size_expected:
-            print("[GL Error] Failed to allocate memory for buffer. ")
-            gl.glDeleteBuffers(1, vertex_buffer);
-            sys.exit()
-
-        # --- UV buffer ---
-        # Generate & bind buffer
-        uv_buffer = gl.glGenBuffers(1)
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, uv_buffer)
-
-        # Allocate memory
-        c_uv_buffer = (ctypes.c_float*len(model_uvmap))(*model_uvmap)
-        gl.glBufferData(gl.GL_ARRAY_BUFFER, c_uv_buffer, gl.GL_DYNAMIC_DRAW)
-        size_expected = ctypes.sizeof(ctypes.c_float) * len(model_uvmap)
-        size_allocated = gl.glGetBufferParameteriv(gl.GL_ARRAY_BUFFER, gl.GL_BUFFER_SIZE)
+        if precision == "f16":
+            # Half float positions (padded to 8 bytes to keep the uv 4-byte aligned) and normalized 16-bit uvs
+            self.vertex_dtype = np.dtype([("position", np.float16, 4), ("uv", np.uint16, 2)])
+            position_type, uv_type, uv_normalized = gl.GL_HALF_FLOAT, gl.GL_UNSIGNED_SHORT, gl.GL_TRUE
+        else:
+            self.vertex_dtype = np.dtype([("position", np.float32, 3), ("uv", np.float32, 2)])
+            position_type, uv_type, uv_normalized = gl.GL_FLOAT, gl.GL_FLOAT, gl.GL_FALSE
+        vertex_array = _pack_vertices(model_vertices, model_uvmap, self.vertex_dtype)
+        if vertex_array is None: sys.exit()
+        self.vertex_count = len(vertex_array)
+
+        # Share the buffer with the viewers showing the same model
+        # Hash the array through the buffer protocol rather than copying it into bytes
+        vertex_hash = hashlib.blake2b(vertex_array.dtype.str.encode())
+        vertex_hash.update(vertex_array.data)
+        vertex_key = vertex_hash.digest()
+        self.vertex_buffer = _buffer_cache.acquire(vertex_key, lambda: self._create_static_buffer(vertex_array))
+
+        # --- Index buffer ---
+        if model_indices is None:
+            self.index_buffer = None
+            self.index_count = 0
+            self.index_type = gl.GL_UNSIGNED_SHORT
+        else:
+            index_array = np.asarray(model_indices).ravel()
+            if model_strips is not None:
+                logger.error("[Viewer Error] model_strips and model_indices cannot be used together. ")
+                sys.exit()
+            if index_array.size % 3 != 0 or np.any(index_array < 0) or np.any(index_array >= self.vertex_count):
+                logger.error("[Viewer Error] model_indices must be triangles of the vertices in model_vertices. ")
+                sys.exit()
+            # 16-bit indices halve the buffer when they are enough
+            if self.vertex_count <= 0x10000:
+                index_array = index_array.astype(np.uint16)
+                self.index_type = gl.GL_UNSIGNED_SHORT
+            else:
+                index_array = index_array.astype(np.uint32)
+                self.index_type = gl.GL_UNSIGNED_INT
+            self.index_count = index_array.size
 
-        if size_allocated != size_expected:
-            print("[GL Error] Failed to allocate memory for buffer. ")
-            gl.glDeleteBuffers(1, uv_buffer);
-            sys.exit()
+            # Share the buffer with the viewers showing the same model
+            index_hash = hashlib.blake2b(b"index" + index_array.dtype.str.encode())
+            index_hash.update(index_array.data)
+            self.index_buffer = _buffer_cache.acquire(index_hash.digest(), lambda: self._create_static_buffer(index_array))
 
         # --- Bind to vertex array object ---
-        self.va_object = gl.glGenVertexArrays(1)
-        gl.glBindVertexArray(self.va_object)
-
-        gl.glEnableVertexAttribArray(0)
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, vertex_buffer)
-        gl.glVertexAttribPointer(0, 3, gl.GL_FLOAT, gl.GL_FALSE, 0, None)
-        gl.glEnableVertexAttribArray(1)
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, uv_buffer)
-        gl.glVertexAttribPointer(1, 2, gl.GL_FLOAT, gl.GL_FALSE, 0, None)
-
-        gl.glBindVertexArray(0)
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+        self.vertex_attributes = [
+                (0, 3, position_type, gl.GL_FALSE, self.vertex_dtype.fields["position"][1]), 
+                (1, 2, uv_type, uv_normalized, self.vertex_dtype.fields["uv"][1])]
+
+        if self.gl_version >= (4, 5):
+            handles = np.zeros(1, dtype=np.uint32)
+            gl.glCreateVertexArrays(1, handles)
+            self.va_object = int(handles[0])
+            for index, size, data_type, normalized, offset in self.vertex_attributes:
+                gl.glEnableVertexArrayAttrib(self.va_object, index)
+                gl.glVertexArrayAttribFormat(self.va_object, index, size, data_type, normalized, offset)
+                gl.glVertexArrayAttribBinding(self.va_object, index, 0)
+            self._point_vertex_attributes(self.vertex_buffer, 0)
+            if self.index_buffer is not None:
+                gl.glVertexArrayElementBuffer(self.va_object, self.index_buffer)
+        else:
+            self.va_object = gl.glGenVertexArrays(1)
+            gl.glBindVertexArray(self.va_object)
+            for index, _, _, _, _ in self.vertex_attributes:
+                gl.glEnableVertexAttribArray(index)
+            self._point_vertex_attributes(self.vertex_buffer, 0)
+            # GL_ELEMENT_ARRAY_BUFFER is a part of the vertex array state, so it has to be bound while the vertex array is. 
+            if self.index_buffer is not None:
+                gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
+            gl.glBindVertexArray(0)
+
+        # --- Draw commands ---
+        if model_strips is None:
+            self.strip_firsts = None
+            self.strip_counts = None
+            self.indirect_buffer = None
+        else:
+            # Validate with signed 64-bit integers, since negative values wrap around when cast to uint32
+            strips = np.asarray(model_strips, dtype=np.int64).reshape(-1, 2)
+            if np.any(strips < 0) or np.any(strips[:, 0] + strips[:, 1] > self.vertex_count):
+                logger.error("[Viewer Error] A strip in model_strips exceeds model_vertices. ")
+                sys.exit()
+            draw_commands = np.zeros(len(strips), dtype=DRAW_ARRAYS_INDIRECT_COMMAND)
+            draw_commands["first"], draw_commands["count"] = strips.astype(np.uint32).T
+            draw_commands["instance_count"] = 1
+            self.strip_firsts = draw_commands["first"].astype(np.int32)
+            self.strip_counts = draw_commands["count"].astype(np.int32)
+
+            if self.gl_version >= (4, 3):
+                # The draw indirect buffer binding is not a part of the vertex array state, and stays bound. 
+                self.indirect_buffer = gl.glGenBuffers(1)
+                gl.glBindBuffer(gl.GL_DRAW_INDIRECT_BUFFER, self.indirect_buffer)
+                gl.glBufferData(gl.GL_DRAW_INDIRECT_BUFFER, draw_commands.nbytes, draw_commands, gl.GL_STATIC_DRAW)
+            else:
+                self.indirect_buffer = None
 
         #========================================
         # Prepare Texture
@@ -301,35 +1245,65 @@ class Viewer:
         # Load image
         image = cv2.imread(texture_filename)
         if image is None:
-            print(f"[CV Error] Cannot open image: {texture_filename}")
+            logger.error("[CV Error] Cannot open image: %s", texture_filename)
             sys.exit()
-        image = cv2.flip(image, 0)
+        # The rows are uploaded from top to bottom as they are. The vertex shader flips the v coordinate instead. 
 
         # Create texture
-        self.texture = gl.glGenTextures(1)
-        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
-
-        # Generate texture
-        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
-        gl.glTexImage2D(
-                gl.GL_TEXTURE_2D,  # target texture
-                0,  # Mipmap Level
-                gl.GL_RGBA,  # The number of color components in the texture
-                image.shape[1],  # the width of texture
-                image.shape[0],  # the height of texture
-                0,  # border (this value must be 0)
-                gl.GL_BGR,  # the format of the pixel data
-                gl.GL_UNSIGNED_BYTE,  # the type of pixel data
-                image)  # a pointer to the image
-
-        # Set parameters
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_BORDER)
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_BORDER)
-
-        # Unbind
-        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+        self.texture_size = (image.shape[1], image.shape[0])
+        # Sample from the mipmap level matching the size on screen when the model is far away
+        levels = int(np.log2(max(image.shape[0], image.shape[1]))) + 1
+        parameters = [
+                (gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR_MIPMAP_LINEAR), 
+                (gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR), 
+                (gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_BORDER), 
+                (gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_BORDER)]
+        # The texels are stored with 4 bytes (3-byte formats are padded by the drivers anyway) to match the streaming uploads of 
+        # update_texture() and update_texture_from_cuda(). The first image is uploaded as is, with its tightly packed rows. 
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 4 if image.shape[1] * 3 % 4 == 0 else 1)
+
+        if self.gl_version >= (4, 5):
+            # Create, allocate and fill texture with direct state access (OpenGL 4.5)
+            handles = np.zeros(1, dtype=np.uint32)
+            gl.glCreateTextures(gl.GL_TEXTURE_2D, 1, handles)
+            self.texture = int(handles[0])
+            gl.glTextureStorage2D(self.texture, levels, gl.GL_RGBA8, image.shape[1], image.shape[0])
+            gl.glTextureSubImage2D(self.texture, 0, 0, 0, image.shape[1], image.shape[0], 
+                    gl.GL_RGB, gl.GL_UNSIGNED_BYTE, image)
+            gl.glGenerateTextureMipmap(self.texture)
+
+            # Set parameters
+            for pname, param in parameters:
+                gl.glTextureParameteri(self.texture, pname, param)
+        else:
+            self.texture = gl.glGenTextures(1)
+            gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
+
+            if self.gl_version >= (4, 2):
+                # Allocate immutable storage and fill it (OpenGL 4.2)
+                gl.glTexStorage2D(gl.GL_TEXTURE_2D, levels, gl.GL_RGBA8, image.shape[1], image.shape[0])
+                gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, 0, 0, image.shape[1], image.shape[0], 
+                        gl.GL_RGB, gl.GL_UNSIGNED_BYTE, image)
+            else:
+                # Generate texture
+                gl.glTexImage2D(
+                        gl.GL_TEXTURE_2D,  # target texture
+                        0,  # Mipmap Level
+                        gl.GL_RGBA8,  # The internal format of the texture
+                        image.shape[1],  # the width of texture
+                        image.shape[0],  # the height of texture
+                        0,  # border (this value must be 0)
+                        gl.GL_RGB,  # the format of the pixel data (BGR in fact, swapped in the shader)
+                        gl.GL_UNSIGNED_BYTE,  # the type of pixel data
+                        image)  # a pointer to the image
+            gl.glGenerateMipmap(gl.GL_TEXTURE_2D)
+
+            # Set parameters
+            for pname, param in parameters:
+                gl.glTexParameteri(gl.GL_TEXTURE_2D, pname, param)
+
+            # Unbind
+            gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
 
         #========================================
         # Prepare Camera Parameters
@@ -338,11 +1312,7 @@ class Viewer:
         # Transform matrix
         trans = glm.vec3(0., 0., 50.)
         rot = glm.vec3(0.)
-        transform_matrix = glm.mat4(1.)
-        transform_matrix = glm.translate(transform_matrix, trans)
-        transform_matrix = glm.rotate(transform_matrix, glm.radians(rot.x), glm.vec3(1., 0., 0.))
-        transform_matrix = glm.rotate(transform_matrix, glm.radians(rot.y), glm.vec3(0., 1., 0.))
-        transform_matrix = glm.rotate(transform_matrix, glm.radians(rot.z), glm.vec3(0., 0., 1.))
+        transform_matrix = _trs(trans, glm.radians(rot))
 
         self.default_camera_property = CameraProperty(
             transform_matrix = transform_matrix, 
@@ -350,40 +1320,32 @@ class Viewer:
             field_of_view = 60.)
 
         self.camera_property = self.default_camera_property.clone()
+        self.camera_dirty = True
+        self.update_perspective_matrix()
 
         #========================================
         # Prepare Shader Programs
         #========================================
         print("- Preparing shaders.")
-        is_loaded: bool = False
-
-        vert_shader = gl.glCreateShader(gl.GL_VERTEX_SHADER)
-        is_loaded = Viewer.load_shader(vert_shader, "glsl/vertex.glsl")
-        if not is_loaded: sys.exit()
-
-        frag_shader = gl.glCreateShader(gl.GL_FRAGMENT_SHADER)
-        is_loaded = Viewer.load_shader(frag_shader, "glsl/fragment.glsl")
-        if not is_loaded: sys.exit()
-
-        # Create shader program
-        self.shader_program = gl.glCreateProgram()
-
-        # Bind shader objects
-        gl.glAttachShader(self.shader_program, vert_shader)
-        gl.glAttachShader(self.shader_program, frag_shader)
-        gl.glDeleteShader(vert_shader)
-        gl.glDeleteShader(frag_shader)
-
-        # Link shader program
-        gl.glLinkProgram(self.shader_program)
-        result = gl.glGetProgramiv(self.shader_program, gl.GL_LINK_STATUS)
-        if result != gl.GL_TRUE:
-            print(f"[GLFW Error] {gl.glGetShaderInfoLog(shader_id)}")
-            sys.exit()
+        # Share the program with the viewers using the same shaders
+        # The texels are uploaded in the byte order of OpenCV (BGR), so let the shader swap the channels. 
+        vs_path, fs_path = "glsl/vertex.glsl", "glsl/fragment.glsl"
+        defines = {"SRC_FORMAT_BGR": "1"}
+        program_key = (_read_shader_source(vs_path, os.path.getmtime(vs_path)), 
+                _read_shader_source(fs_path, os.path.getmtime(fs_path)), 
+                tuple(sorted(defines.items())))
+        self.shader_program = _program_cache.acquire(program_key, 
+                lambda: Viewer.load_or_build_program(vs_path, fs_path, defines))
+        if self.shader_program == 0: sys.exit()
+
+        # Look up uniform variables
+        self.projection_location = gl.glGetUniformLocation(self.shader_program, "projection_matrix")
+        self.view_location = gl.glGetUniformLocation(self.shader_program, "view_matrix")
+        self.sampler_location = gl.glGetUniformLocation(self.shader_program, "sampler")
 
         # Specify uniform variables
         gl.glUseProgram(self.shader_program)
-        gl.glUniform1i(gl.glGetUniformLocation(self.shader_program, "sampler"), 0)
+        gl.glUniform1i(self.sampler_location, 0)
 
         #========================================
         # Prepare Other Instance Variables
@@ -391,10 +1353,35 @@ class Viewer:
         # Cursor status
         self.previous_cursor_status = CursorStatus(
                 button = {
-                    glfw.MOUSE_BUTTON_LEFT: False, 
-                    glfw.MOUSE_BUTTON_RIGHT: False}, 
+                    TRANSLATE_BUTTON: False, 
+                    ROTATE_BUTTON: False}, 
                 position = glm.vec3(0.))
 
+        # Texture streaming (created on the first call of update_texture())
+        self.texture_pbo = None
+        self.texture_pbo_views = []
+        self.texture_fences = []
+        self.texture_ring_index = 0
+
+        # Vertex streaming (created on the first call of update_vertices())
+        self.vertex_ring_buffer = None
+        self.vertex_ring_views = []
+        self.vertex_fences = []
+        self.vertex_ring_index = 0
+
+        # CUDA interop (created on the first call of update_texture_from_cuda())
+        self.cuda_pbo = None
+        self.cuda_resource = None
+
+        # Bind the objects for good. Every viewer has its own context, so nothing else is bound in it. 
+        gl.glUseProgram(self.shader_program)
+        gl.glBindVertexArray(self.va_object)
+        gl.glActiveTexture(gl.GL_TEXTURE0)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
+
+        # Draw the first frame
+        self.needs_redraw = True
+
         print("Initialization done. ")
         Viewer.help()
 
@@ -404,141 +1391,383 @@ class Viewer:
         @brief Update the frame. 
         @return Whether the main loop continues. 
         """
+        # The other viewers may have made their own context current
+        self._make_current()
+
         #========================================
         # Mouse and Keyboard response
         #========================================
+        # The key states are updated by the events processed at the end of the previous frame
+        is_pressed = self.key_states.get
+
         # Exit
-        if glfw.get_key(self.window, glfw.KEY_ESCAPE) == glfw.PRESS:
+        if is_pressed(EXIT_KEY, False):
             return False
 
         # Camera motion (keyboard)
-        if glfw.get_key(self.window, glfw.KEY_SPACE) == glfw.PRESS:
+        if is_pressed(RESET_KEY, False):
             self.camera_property = self.default_camera_property.clone()
+            self.camera_dirty = True
         else:
-            trans = glm.vec3(0.)
-            rot = glm.vec3(0.)
-            trans_delta = 0.01
-            rot_delta = 0.005
-            if glfw.get_key(self.window, glfw.KEY_W) == glfw.PRESS:
-                if glfw.get_key(self.window, glfw.KEY_LEFT_SHIFT) != glfw.PRESS:
-                    trans.z += trans_delta
-                else:
-                    trans.y += trans_delta
-            if glfw.get_key(self.window, glfw.KEY_S) == glfw.PRESS:
-                if glfw.get_key(self.window, glfw.KEY_LEFT_SHIFT) != glfw.PRESS:
-                    trans.z -= trans_delta
-                else:
-                    trans.y -= trans_delta
-            if glfw.get_key(self.window, glfw.KEY_D) == glfw.PRESS:
-                trans.x += trans_delta
-            if glfw.get_key(self.window, glfw.KEY_A) == glfw.PRESS:
-                trans.x -= trans_delta
-            if glfw.get_key(self.window, glfw.KEY_UP) == glfw.PRESS:
-                rot.x += rot_delta
-            if glfw.get_key(self.window, glfw.KEY_DOWN) == glfw.PRESS:
-                rot.x -= rot_delta
-            if glfw.get_key(self.window, glfw.KEY_LEFT) == glfw.PRESS:
-                rot.y += rot_delta
-            if glfw.get_key(self.window, glfw.KEY_RIGHT) == glfw.PRESS:
-                rot.y -= rot_delta
-
-            tmat = glm.mat4(1.)
-            tmat = glm.translate(tmat, -trans)
-            tmat = glm.rotate(tmat, glm.radians(rot.x), glm.vec3(1., 0., 0.))
-            tmat = glm.rotate(tmat, glm.radians(rot.y), glm.vec3(0., 1., 0.))
-            tmat = glm.rotate(tmat, glm.radians(rot.z), glm.vec3(0., 0., 1.))
-            self.camera_property.transform_matrix = tmat * self.camera_property.transform_matrix
+            # Sum up the motions of the held keys
+            motion = self.camera_key_states @ CAMERA_KEY_MOTIONS[int(is_pressed(SHIFT_KEY, False))]
+            trans, rot = motion[:3], motion[3:]
+
+            if rot.any():
+                tmat = _trs(-trans, np.radians(rot))
+                self.camera_property.transform_matrix = tmat @ self.camera_property.transform_matrix
+                self.camera_dirty = True
+            elif trans.any():
+                # The transform is affine, so a translation from the left only moves its last column
+                self.camera_property.transform_matrix[:3, 3] -= trans
+                self.camera_dirty = True
 
         # Camera motion (mouse)
+        # Acquire current cursor status
         current_cursor_status = CursorStatus(
                 button = {
-                    glfw.MOUSE_BUTTON_LEFT: False, 
-                    glfw.MOUSE_BUTTON_RIGHT: False}, 
-                position = None)
-
-        # Acquire current cursor status
-        if glfw.get_mouse_button(self.window, glfw.MOUSE_BUTTON_LEFT) == glfw.PRESS:
-            current_cursor_status.button[glfw.MOUSE_BUTTON_LEFT] = True
-        if glfw.get_mouse_button(self.window, glfw.MOUSE_BUTTON_RIGHT) == glfw.PRESS:
-            current_cursor_status.button[glfw.MOUSE_BUTTON_RIGHT] = True
-        current_cursor_status.position = glm.vec2(glfw.get_cursor_pos(self.window))
+                    TRANSLATE_BUTTON: self._get_mouse_button(self.window, TRANSLATE_BUTTON) == _GLFW_PRESS, 
+                    ROTATE_BUTTON: self._get_mouse_button(self.window, ROTATE_BUTTON) == _GLFW_PRESS}, 
+                position = glm.vec2(self._get_cursor_pos(self.window)))
+        current, previous = current_cursor_status.button, self.previous_cursor_status.button
 
         # Compare current status with previous one
-        if current_cursor_status.button[glfw.MOUSE_BUTTON_LEFT]\
-                and self.previous_cursor_status.button[glfw.MOUSE_BUTTON_LEFT]\
-                and not current_cursor_status.button[glfw.MOUSE_BUTTON_RIGHT]\
-                and not self.previous_cursor_status.button[glfw.MOUSE_BUTTON_RIGHT]:
-                    displ = current_cursor_status.position - self.previous_cursor_status.position
-                    displ *= 0.01  # scaling
-                    displ = glm.vec3(displ.x, -displ.y, 0.)  # 2D -> 3D
-                    tmat = glm.translate(glm.mat4(1.),  displ)
-                    self.camera_property.transform_matrix = tmat * self.camera_property.transform_matrix
-
-        elif current_cursor_status.button[glfw.MOUSE_BUTTON_RIGHT]\
-                and self.previous_cursor_status.button[glfw.MOUSE_BUTTON_RIGHT]\
-                and not current_cursor_status.button[glfw.MOUSE_BUTTON_LEFT]\
-                and not self.previous_cursor_status.button[glfw.MOUSE_BUTTON_LEFT]:
-                    displ = current_cursor_status.position - self.previous_cursor_status.position
-                    displ *= -0.1  # scaling
-                    displ = glm.vec3(displ.y, displ.x, 0.)  # 2D -> 3D
-                    if glm.length(displ) != 0:
-                        tmat = glm.rotate(glm.mat4(1.), glm.radians(glm.length(displ)),  glm.normalize(displ))
-                        self.camera_property.transform_matrix = self.camera_property.transform_matrix * tmat
+        if current[TRANSLATE_BUTTON] and previous[TRANSLATE_BUTTON] and not current[ROTATE_BUTTON] and not previous[ROTATE_BUTTON]:
+            displ = current_cursor_status.position - self.previous_cursor_status.position
+            displ *= 0.01  # scaling
+            displ = glm.vec3(displ.x, -displ.y, 0.)  # 2D -> 3D
+            self.camera_property.transform_matrix[:3, 3] += displ
+            self.camera_dirty = True
+
+        elif current[ROTATE_BUTTON] and previous[ROTATE_BUTTON] and not current[TRANSLATE_BUTTON] and not previous[TRANSLATE_BUTTON]:
+            displ = current_cursor_status.position - self.previous_cursor_status.position
+            displ *= -0.1  # scaling
+            displ = glm.vec3(displ.y, displ.x, 0.)  # 2D -> 3D
+            if glm.length(displ) != 0:
+                tmat = _rotate(glm.radians(glm.length(displ)), displ)
+                self.camera_property.transform_matrix = self.camera_property.transform_matrix @ tmat
+                self.camera_dirty = True
 
         self.previous_cursor_status = current_cursor_status
 
         #========================================
-        # Update the camera matrix
+        # Check the camera matrices
         #========================================
-        self.update_camera_matrix()
+        # The changed matrices are uploaded before drawing
+        if self.camera_dirty or self.perspective_dirty:
+            self.needs_redraw = True
 
         #========================================
         # Draw new buffer
         #========================================
-        # Initialize
-        gl.glClear(gl.GL_COLOR_BUFFER_BIT)
-        #gl.glPolygonMode(gl.GL_FRONT_AND_BACK, gl.GL_LINE);
+        # Skip drawing while the frame is unchanged, still processing the events below
+        is_drawn = self.needs_redraw
+        if is_drawn:
+            # Upload the matrices which have changed, or have been overwritten by the other viewers sharing the program
+            self.update_camera_matrix()
 
-        # Bind program
-        gl.glUseProgram(self.shader_program)
+            # Initialize
+            self._glClear(_GL_COLOR_BUFFER_BIT)
+            #gl.glPolygonMode(gl.GL_FRONT_AND_BACK, gl.GL_LINE);
+
+            # Draw (the program, the vertex array and the texture stay bound since __init__())
+            if self.index_buffer is not None:
+                self._glDrawElements(_GL_TRIANGLES, self.index_count, self.index_type, None)
+            elif self.strip_firsts is None:
+                self._glDrawArrays(_GL_TRIANGLE_STRIP, 0, self.vertex_count)
+            elif self.indirect_buffer is not None:
+                self._glMultiDrawArraysIndirect(_GL_TRIANGLE_STRIP, None, len(self.strip_firsts), 0)
+            else:
+                self._glMultiDrawArrays(_GL_TRIANGLE_STRIP, self.strip_firsts, self.strip_counts, len(self.strip_firsts))
 
-        # Bind buffer
-        gl.glBindVertexArray(self.va_object)
+            # Update
+            self._swap_buffers(self.window)
+            self.needs_redraw = False
 
-        # Bind buffer
-        gl.glActiveTexture(gl.GL_TEXTURE0)
-        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
+        # Process events
+        if self.poll_mode == "auto":
+            # Keep the frame rate while the view is changing (e.g. a key is held), and sleep while it is idle
+            if is_drawn:
+                self._poll_events()
+            else:
+                self._wait_events_timeout(IDLE_TIMEOUT)
+        elif self.poll_mode == "poll":
+            self._poll_events()
+        elif self.poll_mode == "wait":
+            self._wait_events()
+        else:
+            self._wait_events_timeout(self.poll_budget)
 
-        # Draw
-        gl.glDrawArrays(gl.GL_TRIANGLE_STRIP, 0, len(model_vertices) // 3)
+        return self._window_should_close(self.window) != _GL_TRUE
 
-        # Unbind
+    def close(self):
+        """
+        @fn close()
+        @brief Release the OpenGL objects and the window of the viewer. 
+        @detail GLFW is terminated when the last viewer is closed. 
+        """
+        global _share_window, _glfw_refcount
+        if self.window is None:
+            return
+
+        glfw.make_context_current(self.window)
+
+        # The context of _share_window outlives the viewer, and GL does not free the objects still bound in it
+        gl.glUseProgram(0)
         gl.glBindVertexArray(0)
         gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+        if self.indirect_buffer is not None:
+            # Only created with glMultiDrawArraysIndirect (OpenGL 4.3), so the target may not exist otherwise
+            gl.glBindBuffer(gl.GL_DRAW_INDIRECT_BUFFER, 0)
+
+        if self.cuda_resource is not None:
+            _import_cudart().cudaGraphicsUnregisterResource(self.cuda_resource)
+        for fence in self.texture_fences + self.vertex_fences:
+            if fence is not None:
+                gl.glDeleteSync(fence)
+        buffers = [buffer for buffer in (self.indirect_buffer, self.vertex_ring_buffer, self.texture_pbo, self.cuda_pbo) 
+                if buffer is not None]
+        if buffers:
+            gl.glDeleteBuffers(len(buffers), buffers)
+        gl.glDeleteVertexArrays(1, [self.va_object])
+        gl.glDeleteTextures(1, [self.texture])
+        _buffer_cache.release(self.vertex_buffer)
+        if self.index_buffer is not None:
+            _buffer_cache.release(self.index_buffer)
+        if _program_users.get(self.shader_program) is self:
+            del _program_users[self.shader_program]
+        _program_cache.release(self.shader_program)
+
+        _glfw_refcount -= 1
+        if _glfw_refcount == 0:
+            # Terminating GLFW destroys the remaining windows and the memoized shaders with them
+            glfw.terminate()
+            _compile_shader.cache_clear()
+            _program_cache.clear()
+            _program_users.clear()
+            _buffer_cache.clear()
+            _share_window = None
+        elif self.window is _share_window:
+            # The other windows share the objects through this context, so keep it until GLFW is terminated
+            glfw.hide_window(self.window)
+        else:
+            glfw.destroy_window(self.window)
+        self.window = None
+
+    def update_vertices(self, model_vertices: typing.Union[np.ndarray, typing.List[float]], model_uvmap: typing.Union[np.ndarray, typing.List[float]]) -> bool:
+        """
+        @fn update_vertices()
+        @brief Replace the vertices of the model. 
+        @param model_vertices The list of vertices in the model, in the same format as in __init__(). 
+        @param model_uvmap The uvmapping which associate model_vertices with textures. 
+        @return Whether the update succeeded. 
+        @detail The vertices are written into a persistently mapped buffer, which is a ring of VERTEX_RING_SIZE regions. 
+        @detail A region is only rewritten after the GPU has finished drawing from it, so the update never stalls on the frames in flight. 
+        @detail Without glBufferStorage (OpenGL < 4.4) the storage of the buffer is orphaned and uploaded again. 
+        @note The number of vertices must not change, since the draw commands are kept. 
+        """
+        vertex_array = _pack_vertices(model_vertices, model_uvmap, self.vertex_dtype)
+        if vertex_array is None:
+            return False
+        if len(vertex_array) != self.vertex_count:
+            logger.error("[Viewer Error] The model must have %d vertices, got %d. ", self.vertex_count, len(vertex_array))
+            return False
+
+        # The vertex array is bound in the context of this viewer
+        self._make_current()
+
+        nbytes = vertex_array.nbytes
+        if self.gl_version < (4, 4):
+            # The buffer in the cache is shared with the other viewers, so write to a buffer of this viewer
+            if self.vertex_ring_buffer is None:
+                self.vertex_ring_buffer = gl.glGenBuffers(1)
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vertex_ring_buffer)
+            gl.glBufferData(gl.GL_ARRAY_BUFFER, nbytes, vertex_array, gl.GL_STREAM_DRAW)
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+            self._point_vertex_attributes(self.vertex_ring_buffer, 0)
+            self.needs_redraw = True
+            return True
+
+        # Create a persistently mapped vertex buffer
+        if self.vertex_ring_buffer is None:
+            flags = gl.GL_MAP_WRITE_BIT | gl.GL_MAP_PERSISTENT_BIT | gl.GL_MAP_COHERENT_BIT
+            self.vertex_ring_buffer = gl.glGenBuffers(1)
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vertex_ring_buffer)
+            gl.glBufferStorage(gl.GL_ARRAY_BUFFER, nbytes * VERTEX_RING_SIZE, None, flags)
+            pointer = gl.glMapBufferRange(gl.GL_ARRAY_BUFFER, 0, nbytes * VERTEX_RING_SIZE, flags)
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+            self.vertex_ring_views = [
+                    np.ctypeslib.as_array((ctypes.c_ubyte * nbytes).from_address(pointer + i * nbytes)).view(self.vertex_dtype)
+                    for i in range(VERTEX_RING_SIZE)]
+            self.vertex_fences = [None] * VERTEX_RING_SIZE
+
+        # Wait until the GPU has finished drawing from the next region
+        index = (self.vertex_ring_index + 1) % VERTEX_RING_SIZE
+        fence = self.vertex_fences[index]
+        if fence is not None:
+            while gl.glClientWaitSync(fence, gl.GL_SYNC_FLUSH_COMMANDS_BIT, 1000000) == gl.GL_TIMEOUT_EXPIRED:
+                pass
+            gl.glDeleteSync(fence)
+            self.vertex_fences[index] = None
+
+        # Write the vertices into the region and draw from there
+        self.vertex_ring_views[index][:] = vertex_array
+        self._point_vertex_attributes(self.vertex_ring_buffer, index * nbytes)
+
+        # Every draw reading the previous region has been issued by now
+        self.vertex_fences[self.vertex_ring_index] = gl.glFenceSync(gl.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        self.vertex_ring_index = index
+        self.needs_redraw = True
+
+        return True
+
+    def update_texture(self, image: np.ndarray) -> bool:
+        """
+        @fn update_texture()
+        @brief Replace the texture with an image in host memory. 
+        @param image The image in the format returned by cv2.imread(). It must be as large as the texture. 
+        @return Whether the update succeeded. 
+        @detail The image is written as BGRA into a persistently mapped pixel buffer, which is a ring of TEXTURE_RING_SIZE regions. 
+        @detail A region is only rewritten after the GPU has finished reading it, so the upload never stalls on the texture in use. 
+        @detail Without glBufferStorage (OpenGL < 4.4) the image is uploaded directly. 
+        """
+        width, height = self.texture_size
+        if image.shape != (height, width, 3) or image.dtype != np.uint8:
+            logger.error("[Viewer Error] The image must be %dx%d BGR, got %s %s. ", width, height, image.shape, image.dtype)
+            return False
+
+        # The texture is bound in the context of this viewer
+        self._make_current()
+
+        if self.gl_version < (4, 4):
+            gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, 0, 0, width, height, 
+                    gl.GL_RGB, gl.GL_UNSIGNED_BYTE, image)
+            gl.glGenerateMipmap(gl.GL_TEXTURE_2D)
+            self.needs_redraw = True
+            return True
+
+        # Create a persistently mapped pixel buffer object
+        nbytes = width * height * 4
+        if self.texture_pbo is None:
+            flags = gl.GL_MAP_WRITE_BIT | gl.GL_MAP_PERSISTENT_BIT | gl.GL_MAP_COHERENT_BIT
+            self.texture_pbo = gl.glGenBuffers(1)
+            gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, self.texture_pbo)
+            gl.glBufferStorage(gl.GL_PIXEL_UNPACK_BUFFER, nbytes * TEXTURE_RING_SIZE, None, flags)
+            pointer = gl.glMapBufferRange(gl.GL_PIXEL_UNPACK_BUFFER, 0, nbytes * TEXTURE_RING_SIZE, flags)
+            self.texture_pbo_views = [
+                    np.ctypeslib.as_array((ctypes.c_ubyte * nbytes).from_address(pointer + i * nbytes)).reshape(height, width, 4)
+                    for i in range(TEXTURE_RING_SIZE)]
+            # The alpha channel is never written by the updates
+            for view in self.texture_pbo_views:
+                view[..., 3] = 255
+            self.texture_fences = [None] * TEXTURE_RING_SIZE
+        else:
+            gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, self.texture_pbo)
+
+        # Wait until the GPU has finished reading the region
+        index = self.texture_ring_index
+        fence = self.texture_fences[index]
+        if fence is not None:
+            while gl.glClientWaitSync(fence, gl.GL_SYNC_FLUSH_COMMANDS_BIT, 1000000) == gl.GL_TIMEOUT_EXPIRED:
+                pass
+            gl.glDeleteSync(fence)
+
+        # Write the image into the BGR channels of the region and upload it from there
+        self.texture_pbo_views[index][..., :3] = image
+        gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, 0, 0, width, height, 
+                gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, ctypes.c_void_p(index * nbytes))
+        gl.glGenerateMipmap(gl.GL_TEXTURE_2D)
+        self.texture_fences[index] = gl.glFenceSync(gl.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        self.texture_ring_index = (index + 1) % TEXTURE_RING_SIZE
+
+        gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, 0)
+        self.needs_redraw = True
+
+        return True
+
+    def update_texture_from_cuda(self, dev_ptr: int, nbytes: int, stream: int = 0) -> bool:
+        """
+        @fn update_texture_from_cuda()
+        @brief Replace the texture with an image in CUDA device memory without a roundtrip through host memory. 
+        @param dev_ptr The device pointer to the image. 
+        @param nbytes The size of the image in bytes. 
+        @param stream The CUDA stream on which the copy is issued. 
+        @return Whether the update succeeded. 
+        @note The image must be BGRA with 8 bits per channel and as large as the texture, with rows from top to bottom. 
+        @note This requires cuda-python. 
+        """
+        cudart = _import_cudart()
+        if cudart is None:
+            logger.error("[CUDA Error] cuda-python is not installed. ")
+            return False
 
-        # Update
-        glfw.swap_buffers(self.window)
-        glfw.poll_events()
+        width, height = self.texture_size
+        if nbytes != width * height * 4:
+            logger.error("[CUDA Error] The image must be %dx%d BGRA (%d bytes), got %d bytes. ", width, height, width * height * 4, nbytes)
+            return False
+
+        # The texture is bound in the context of this viewer
+        self._make_current()
+
+        # Create a pixel buffer object and register it to CUDA
+        if self.cuda_pbo is None:
+            self.cuda_pbo = gl.glGenBuffers(1)
+            gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, self.cuda_pbo)
+            gl.glBufferData(gl.GL_PIXEL_UNPACK_BUFFER, nbytes, None, gl.GL_STREAM_DRAW)
+            gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, 0)
+
+            err, self.cuda_resource = cudart.cudaGraphicsGLRegisterBuffer(int(self.cuda_pbo), 
+                    cudart.cudaGraphicsRegisterFlags.cudaGraphicsRegisterFlagsWriteDiscard)
+            if err != cudart.cudaError_t.cudaSuccess:
+                logger.error("[CUDA Error] Failed to register the pixel buffer: %s", err)
+                gl.glDeleteBuffers(1, [self.cuda_pbo])
+                self.cuda_pbo = None
+                self.cuda_resource = None
+                return False
+
+        # Copy the image device-to-device into the pixel buffer
+        err, = cudart.cudaGraphicsMapResources(1, self.cuda_resource, stream)
+        if err != cudart.cudaError_t.cudaSuccess:
+            logger.error("[CUDA Error] Failed to map the pixel buffer: %s", err)
+            return False
+        err, pbo_ptr, _ = cudart.cudaGraphicsResourceGetMappedPointer(self.cuda_resource)
+        if err == cudart.cudaError_t.cudaSuccess:
+            err, = cudart.cudaMemcpyAsync(pbo_ptr, dev_ptr, nbytes, 
+                    cudart.cudaMemcpyKind.cudaMemcpyDeviceToDevice, stream)
+        # Unmapping orders the copy before the following GL commands. 
+        cudart.cudaGraphicsUnmapResources(1, self.cuda_resource, stream)
+        if err != cudart.cudaError_t.cudaSuccess:
+            logger.error("[CUDA Error] Failed to copy the image: %s", err)
+            return False
+
+        # Update the texture from the pixel buffer
+        gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, self.cuda_pbo)
+        gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, 0, 0, width, height, 
+                gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        gl.glGenerateMipmap(gl.GL_TEXTURE_2D)
+        gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, 0)
+        self.needs_redraw = True
+
+        return True
 
-        return glfw.window_should_close(self.window) != gl.GL_TRUE
-        
 
 # Sample Code
 if __name__ == "__main__":
-    model_vertices = [
+    model_vertices = np.array([
          10,  10, 0., 
         -10,  10, 0., 
          10, -10, 0., 
-        -10, -10, 0.]
+        -10, -10, 0.], dtype=np.float32)
 
-    model_uvmap = [
+    model_uvmap = np.array([
         1.0, 1.0, 
         0.0, 1.0, 
         1.0, 0.0, 
-        0.0, 0.0]
+        0.0, 0.0], dtype=np.float32)
 
     viewer = Viewer(model_vertices, model_uvmap, "img/invader.png", "Sample")
     while True:
         if not viewer.update():
             print("Exit. ")
             break
+    viewer.close()